@@ -75,6 +75,7 @@ class BaseModel(ABC):
         ), f"saving_strategy must be one of {saving_strategies}, but got f{model_saving_strategy}."
 
         self.device = None  # set up with _setup_device() below
+        self._device_type = None  # set up with _setup_device() below
         self.saving_path = None  # set up with _setup_path() below
         self.model_saving_strategy = model_saving_strategy
         self.verbose = verbose
@@ -143,6 +144,12 @@ class BaseModel(ABC):
 
             logger.info(f"Using the given device: {self.device}")
 
+        # cache the device type once, so decisions on the hot path (e.g. autocast) don't need to check self.device,
+        # and multiple devices are all CUDA devices
+        self._device_type = (
+            self.device[0].type if isinstance(self.device, list) else self.device.type
+        )
+
         # check CUDA availability if using CUDA
         if (isinstance(self.device, list) and "cuda" in self.device[0].type) or (
             isinstance(self.device, torch.device) and "cuda" in self.device.type
@@ -195,13 +202,15 @@ class BaseModel(ABC):
             self.model = self.model.to(self.device)
 
     def _send_data_to_given_device(self, data) -> Iterable:
+        # non_blocking makes the copies asynchronous if tensors are in pinned memory (e.g. from a DataLoader
+        # with pin_memory=True), so they can overlap with computation on the device
         if isinstance(self.device, torch.device):  # single device
-            data = map(lambda x: x.to(self.device), data)
+            data = map(lambda x: x.to(self.device, non_blocking=True), data)
         else:  # parallely training on multiple devices
             # randomly choose one device to balance the workload
             # device = np.random.choice(self.device)
 
-            data = map(lambda x: x.cuda(), data)
+            data = map(lambda x: x.cuda(non_blocking=True), data)
 
         return data
 
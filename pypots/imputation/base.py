@@ -6,13 +6,14 @@ The base class for PyPOTS imputation models.
 # License: BSD-3-Clause
 
 
+import contextlib
 import os
 from abc import abstractmethod
 from typing import Union, Optional
 
 import numpy as np
 import torch
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, Dataset, get_worker_info
 
 from ..base import BaseModel, BaseNNModel
 from ..utils.logging import logger
@@ -134,6 +135,100 @@ class BaseImputer(BaseModel):
         raise NotImplementedError
 
 
+def _worker_init_fn(worker_id: int) -> None:
+    """Drop the h5 file handle inherited from the main process in each dataloader worker, so every worker opens its
+    own handle lazily when fetching data. Sharing one h5 file handle across processes is not safe.
+    """
+    dataset = get_worker_info().dataset
+    if getattr(dataset, "file_handle", None) is not None:
+        dataset.file_handle = None
+
+
+class _CompiledModule(torch.nn.Module):
+    """Wrap a module compiled by :func:`torch.compile` to fall back to the original eager module once the compiled one
+    fails. torch.compile is lazy, so errors of compiling, e.g. from operations unsupported by TorchDynamo, only show up
+    when the compiled module gets called for the first time.
+
+    Parameters
+    ----------
+    compiled_module :
+        The module returned by :func:`torch.compile`.
+
+    """
+
+    def __init__(self, compiled_module: torch.nn.Module):
+        super().__init__()
+        self.compiled_module = compiled_module
+        self.failed = False
+
+    def forward(self, *args, **kwargs):
+        if not self.failed:
+            try:
+                return self.compiled_module(*args, **kwargs)
+            except Exception as e:
+                logger.warning(
+                    f"‼️ Failed to run the model compiled by torch.compile: {e}\n"
+                    f"The model will be trained in eager mode."
+                )
+                self.failed = True
+        return self.compiled_module._orig_mod(*args, **kwargs)
+
+
+class _CUDAPrefetcher:
+    """Wrap a dataloader to send the next batch to the CUDA device on a side stream while the current batch is
+    being processed on the default stream, so the host-to-device copies can be hidden behind the computation.
+
+    Parameters
+    ----------
+    loader :
+        The dataloader to prefetch batches from. It should set ``pin_memory=True`` to make the copies asynchronous.
+
+    device :
+        The CUDA device to send the batches to.
+
+    """
+
+    def __init__(self, loader: DataLoader, device: torch.device):
+        self.loader = loader
+        self.device = device
+        self.stream = torch.cuda.Stream(device=device)
+
+    def __len__(self) -> int:
+        return len(self.loader)
+
+    def __iter__(self):
+        loader_iter = iter(self.loader)
+        next_batch = self._preload(loader_iter)
+        while next_batch is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(self.stream)
+            batch = next_batch
+            for x in batch:
+                if isinstance(x, torch.Tensor):
+                    # tell the caching allocator the tensor is used on the current stream,
+                    # so its memory won't be reused by the side stream before the current step is done
+                    x.record_stream(current_stream)
+            next_batch = self._preload(loader_iter)
+            yield batch
+
+    def _preload(self, loader_iter) -> Optional[list]:
+        try:
+            batch = next(loader_iter)
+        except StopIteration:
+            return None
+
+        with torch.cuda.stream(self.stream):
+            batch = [
+                (
+                    x.to(self.device, non_blocking=True)
+                    if isinstance(x, torch.Tensor)
+                    else x
+                )
+                for x in batch
+            ]
+        return batch
+
+
 class BaseNNImputer(BaseNNModel):
     """The abstract class for all neural-network imputation models in PyPOTS.
 
@@ -176,6 +271,26 @@ class BaseNNImputer(BaseNNModel):
 
     verbose :
         Whether to print out the training logs during the training process.
+
+    compile_mode :
+        The mode for :func:`torch.compile` to compile the model with during training, has to be one of
+        [None, "default", "reduce-overhead", "max-autotune"]. If None, the model will be trained in eager mode.
+        If torch.compile is not available in the installed PyTorch or fails to compile the model,
+        the training will fall back to the eager mode.
+
+    val_batch_size :
+        Size of the batch input into the model for one step during validating.
+        If not given, will be the same as ``batch_size``. Since no gradients are kept for validating,
+        a larger one can be given to speed up the validation.
+
+    use_amp :
+        Whether to train the model with automatic mixed precision (AMP), i.e. running the forward pass under
+        :class:`torch.autocast` with the dtype ``amp_dtype``.
+
+    amp_dtype :
+        The lower-precision dtype used by AMP, torch.bfloat16 or torch.float16.
+        If torch.float16 is used on CUDA devices, the loss will be scaled with a gradient scaler to avoid underflow.
+
     Notes
     -----
     Optimizers are necessary for training deep-learning neural networks, but we don't put  a parameter ``optimizer``
@@ -186,6 +301,9 @@ class BaseNNImputer(BaseNNModel):
 
     """
 
+    # the name of the validation loss returned by _calc_val_loss() to be logged into the tensorboard file
+    _val_loss_name = "imputation_loss"
+
     def __init__(
         self,
         batch_size: int,
@@ -196,6 +314,10 @@ class BaseNNImputer(BaseNNModel):
         saving_path: str = None,
         model_saving_strategy: Optional[str] = "best",
         verbose: bool = True,
+        compile_mode: Optional[str] = None,
+        val_batch_size: Optional[int] = None,
+        use_amp: bool = False,
+        amp_dtype: torch.dtype = torch.bfloat16,
     ):
         super().__init__(
             batch_size,
@@ -208,6 +330,20 @@ class BaseNNImputer(BaseNNModel):
             verbose,
         )
 
+        compile_modes = [None, "default", "reduce-overhead", "max-autotune"]
+        assert (
+            compile_mode in compile_modes
+        ), f"compile_mode must be one of {compile_modes}, but got {compile_mode}."
+        self.compile_mode = compile_mode
+        self.val_batch_size = batch_size if val_batch_size is None else val_batch_size
+
+        amp_dtypes = [torch.bfloat16, torch.float16]
+        assert (
+            amp_dtype in amp_dtypes
+        ), f"amp_dtype must be one of {amp_dtypes}, but got {amp_dtype}."
+        self.use_amp = use_amp
+        self.amp_dtype = amp_dtype
+
     @abstractmethod
     def _assemble_input_for_training(self, data: list) -> dict:
         """Assemble the given data into a dictionary for training input.
@@ -264,6 +400,153 @@ class BaseNNImputer(BaseNNModel):
         """
         raise NotImplementedError
 
+    def _build_loader(
+        self,
+        dataset: Dataset,
+        shuffle: bool,
+        batch_size: Optional[int] = None,
+        persistent_workers: bool = False,
+    ) -> DataLoader:
+        """Build a dataloader for the given dataset with the data loading settings of the model.
+
+        Batches are put in pinned memory if the model runs on CUDA, so they can be sent to the device asynchronously.
+        If ``num_workers`` > 0, each worker prefetches several batches.
+
+        Parameters
+        ----------
+        dataset :
+            The dataset to load data from.
+
+        shuffle :
+            Whether to shuffle the data at every epoch.
+
+        batch_size :
+            The batch size of the dataloader. If not given, will use ``batch_size`` of the model.
+
+        persistent_workers :
+            Whether to keep the worker processes alive after iterating over the dataset, so they can be reused
+            in the next epochs. Only for dataloaders iterated for multiple times, i.e. training and validating ones.
+            Only works if ``num_workers`` > 0.
+
+        Returns
+        -------
+        DataLoader,
+            The built dataloader.
+        """
+        worker_kwargs = {}
+        if self.num_workers > 0:
+            worker_kwargs = {
+                "persistent_workers": persistent_workers,
+                "prefetch_factor": 4,
+                "worker_init_fn": _worker_init_fn,
+            }
+
+        return DataLoader(
+            dataset,
+            batch_size=self.batch_size if batch_size is None else batch_size,
+            shuffle=shuffle,
+            num_workers=self.num_workers,
+            pin_memory=self._device_type == "cuda",
+            **worker_kwargs,
+        )
+
+    def _compile_model_if_necessary(self) -> torch.nn.Module:
+        """Compile the model with :func:`torch.compile` for training if ``compile_mode`` is set.
+
+        Returns
+        -------
+        torch.nn.Module,
+            The compiled model, which shares parameters with ``self.model`` and falls back to it if failing to run,
+            or ``self.model`` itself if compiling is disabled, unsupported or failed.
+        """
+        if self.compile_mode is None:
+            return self.model
+
+        if not hasattr(torch, "compile"):
+            logger.warning(
+                f"‼️ torch.compile is not available in PyTorch {torch.__version__}, "
+                f"the model will be trained in eager mode."
+            )
+            return self.model
+
+        try:
+            compiled_model = torch.compile(
+                self.model, mode=self.compile_mode, dynamic=False
+            )
+        except Exception as e:
+            logger.warning(
+                f"‼️ Failed to compile the model with torch.compile: {e}\n"
+                f"The model will be trained in eager mode."
+            )
+            return self.model
+
+        return _CompiledModule(compiled_model)
+
+    def _calc_val_loss(
+        self,
+        model: torch.nn.Module,
+        inputs: dict,
+    ) -> torch.Tensor:
+        """Calculate the validation loss of one batch, which decides the best model and the early stopping.
+
+        It is the MSE between the imputation results and the ground truth on the artificially-masked values by default.
+        Models validated with another metric should override this method and ``_val_loss_name``.
+
+        Parameters
+        ----------
+        model :
+            The model to run the forward pass with, may be the compiled ``self.model``.
+
+        inputs :
+            The batch input assembled by ``_assemble_input_for_validating()``.
+
+        Returns
+        -------
+        torch.Tensor,
+            The validation loss of the batch.
+        """
+        results = model.forward(inputs, training=False)
+        imputation_mse = calc_mse(
+            results["imputed_data"],
+            inputs["X_ori"],
+            inputs["indicating_mask"],
+        ).sum()
+        return imputation_mse
+
+    def _autocast(self):
+        """Get the context to run the model's forward in. Autocast only gets entered if AMP is enabled,
+        because some torch versions raise for device types that autocast doesn't support even when it's disabled.
+        """
+        if self.use_amp:
+            return torch.autocast(device_type=self._device_type, dtype=self.amp_dtype)
+        return contextlib.nullcontext()
+
+    def _synchronize_device(self) -> None:
+        """Wait for the work queued on the CUDA device(s) of the model, only the ones in ``self.device``."""
+        if self._device_type == "cuda":
+            devices = self.device if isinstance(self.device, list) else [self.device]
+            for device in devices:
+                torch.cuda.synchronize(device)
+
+    def _update_best_model_dict(self) -> None:
+        """Copy the current model parameters into ``self.best_model_dict``.
+
+        Simply referring to ``self.model.state_dict()`` only aliases the live parameters, which will be overwritten
+        by the following training steps. Hence, CPU buffers are allocated at the first call (pinned if the parameters
+        are on CUDA) and the parameters are copied into them asynchronously at every call.
+        """
+        state_dict = self.model.state_dict()
+        if self.best_model_dict is None:
+            self.best_model_dict = {
+                k: torch.empty(
+                    v.shape, dtype=v.dtype, device="cpu", pin_memory=v.is_cuda
+                )
+                for k, v in state_dict.items()
+            }
+        with torch.no_grad():
+            for k, v in state_dict.items():
+                self.best_model_dict[k].copy_(v, non_blocking=True)
+
     def _train_model(
         self,
         training_loader: DataLoader,
@@ -272,66 +555,86 @@ class BaseNNImputer(BaseNNModel):
         # each training starts from the very beginning, so reset the loss and model dict here
         self.best_loss = float("inf")
         self.best_model_dict = None
+        # self.device and self._device_type are set up once in __init__(), use them directly for tensor moves and
+        # device-type decisions in the loops below rather than parsing device strings again
+        # the compiled model shares parameters with self.model, so the optimizer and checkpoints still use self.model
+        compiled_model = self._compile_model_if_necessary()
+        # prefetch training batches onto the device on a side stream if training on a single CUDA device
+        if isinstance(self.device, torch.device) and self._device_type == "cuda":
+            training_loader = _CUDAPrefetcher(training_loader, self.device)
+        # the gradient scaler is only necessary for float16 AMP on CUDA
+        grad_scaler = None
+        if (
+            self.use_amp
+            and self.amp_dtype == torch.float16
+            and self._device_type == "cuda"
+        ):
+            grad_scaler = (
+                torch.amp.GradScaler("cuda")
+                if hasattr(torch.amp, "GradScaler")
+                else torch.cuda.amp.GradScaler()
+            )
 
         try:
             training_step = 0
             for epoch in range(1, self.epochs + 1):
                 self.model.train()
-                epoch_train_loss_collector = []
+                # accumulate losses on the device to avoid syncing with the host by item() at every step,
+                # the sum turns into a tensor on the loss's device after the first addition
+                train_loss_sum, n_train_batches = 0, 0
                 for idx, data in enumerate(training_loader):
                     training_step += 1
                     inputs = self._assemble_input_for_training(data)
-                    self.optimizer.zero_grad()
-                    results = self.model.forward(inputs)
+                    self.optimizer.zero_grad(set_to_none=True)
+                    with self._autocast():
+                        results = compiled_model.forward(inputs)
                     # use sum() before backward() in case of multi-gpu training
-                    results["loss"].sum().backward()
-                    self.optimizer.step()
-                    epoch_train_loss_collector.append(results["loss"].sum().item())
+                    loss = results["loss"].sum()
+                    if grad_scaler is not None:
+                        loss = grad_scaler.scale(loss)
+                    loss.backward()
+                    self.optimizer.step(grad_scaler=grad_scaler)
+                    train_loss_sum += results["loss"].sum().detach()
+                    n_train_batches += 1
 
                     # save training loss logs into the tensorboard file for every step if in need
                     if self.summary_writer is not None:
                         self._save_log_into_tb_file(training_step, "training", results)
 
                 # mean training loss of the current epoch
-                mean_train_loss = np.mean(epoch_train_loss_collector)
+                mean_train_loss = (train_loss_sum / n_train_batches).item()
 
                 if val_loader is not None:
                     self.model.eval()
-                    imputation_loss_collector = []
-                    with torch.no_grad():
+                    val_loss_sum, n_val_batches = 0, 0
+                    with torch.inference_mode():
                         for idx, data in enumerate(val_loader):
                             inputs = self._assemble_input_for_validating(data)
-                            results = self.model.forward(inputs, training=False)
-                            imputation_mse = (
-                                calc_mse(
-                                    results["imputed_data"],
-                                    inputs["X_ori"],
-                                    inputs["indicating_mask"],
+                            with self._autocast():
+                                val_loss_sum += self._calc_val_loss(
+                                    compiled_model, inputs
                                 )
-                                .sum()
-                                .detach()
-                                .item()
-                            )
-                            imputation_loss_collector.append(imputation_mse)
+                            n_val_batches += 1
 
-                    mean_val_loss = np.mean(imputation_loss_collector)
+                    mean_val_loss = (val_loss_sum / n_val_batches).item()
 
                     # save validation loss logs into the tensorboard file for every epoch if in need
                     if self.summary_writer is not None:
                         val_loss_dict = {
-                            "imputation_loss": mean_val_loss,
+                            self._val_loss_name: val_loss_sum / n_val_batches,
                         }
                         self._save_log_into_tb_file(epoch, "validating", val_loss_dict)
 
                     logger.info(
-                        f"Epoch {epoch:03d} - "
-                        f"training loss: {mean_train_loss:.4f}, "
-                        f"validation loss: {mean_val_loss:.4f}"
+                        "Epoch %03d - training loss: %.4f, validation loss: %.4f",
+                        epoch,
+                        mean_train_loss,
+                        mean_val_loss,
                     )
                     mean_loss = mean_val_loss
                 else:
                     logger.info(
-                        f"Epoch {epoch:03d} - training loss: {mean_train_loss:.4f}"
+                        "Epoch %03d - training loss: %.4f", epoch, mean_train_loss
                     )
                     mean_loss = mean_train_loss
 
@@ -343,7 +646,7 @@ class BaseNNImputer(BaseNNModel):
                 if mean_loss < self.best_loss:
                     self.best_epoch = epoch
                     self.best_loss = mean_loss
-                    self.best_model_dict = self.model.state_dict()
+                    self._update_best_model_dict()
                     self.patience = self.original_patience
                 else:
                     self.patience -= 1
@@ -383,6 +686,9 @@ class BaseNNImputer(BaseNNModel):
         if np.isnan(self.best_loss):
             raise ValueError("Something is wrong. best_loss is Nan after training.")
 
+        # make sure the asynchronous copies into self.best_model_dict are finished
+        self._synchronize_device()
+
         logger.info(
             f"Finished training. The best model is from epoch#{self.best_epoch}."
         )
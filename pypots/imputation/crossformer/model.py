@@ -10,7 +10,6 @@ from typing import Union, Optional
 
 import numpy as np
 import torch
-from torch.utils.data import DataLoader
 
 from .core import _Crossformer
 from .data import DatasetForCrossformer
@@ -104,6 +103,19 @@ class Crossformer(BaseNNImputer):
 
     verbose :
         Whether to print out the training logs during the training process.
+
+    compile_mode :
+        The mode for :func:`torch.compile` to compile the model with during training, has to be one of
+        [None, "default", "reduce-overhead", "max-autotune"]. If None, the model will be trained in eager mode.
+
+    val_batch_size :
+        The batch size for validating the model. If not given, will be the same as ``batch_size``.
+
+    use_amp :
+        Whether to train the model with automatic mixed precision (AMP).
+
+    amp_dtype :
+        The lower-precision dtype used by AMP, torch.bfloat16 or torch.float16.
     """
 
     def __init__(
@@ -129,6 +141,10 @@ class Crossformer(BaseNNImputer):
         saving_path: str = None,
         model_saving_strategy: Optional[str] = "best",
         verbose: bool = True,
+        compile_mode: Optional[str] = None,
+        val_batch_size: Optional[int] = None,
+        use_amp: bool = False,
+        amp_dtype: torch.dtype = torch.bfloat16,
     ):
         super().__init__(
             batch_size,
@@ -139,6 +155,10 @@ class Crossformer(BaseNNImputer):
             saving_path,
             model_saving_strategy,
             verbose,
+            compile_mode,
+            val_batch_size,
+            use_amp,
+            amp_dtype,
         )
 
         self.n_steps = n_steps
@@ -218,11 +238,8 @@ class Crossformer(BaseNNImputer):
         training_set = DatasetForCrossformer(
             train_set, return_X_ori=False, return_y=False, file_type=file_type
         )
-        training_loader = DataLoader(
-            training_set,
-            batch_size=self.batch_size,
-            shuffle=True,
-            num_workers=self.num_workers,
+        training_loader = self._build_loader(
+            training_set, shuffle=True, persistent_workers=True
         )
         val_loader = None
         if val_set is not None:
@@ -231,11 +248,11 @@ class Crossformer(BaseNNImputer):
             val_set = DatasetForCrossformer(
                 val_set, return_X_ori=True, return_y=False, file_type=file_type
             )
-            val_loader = DataLoader(
+            val_loader = self._build_loader(
                 val_set,
-                batch_size=self.batch_size,
                 shuffle=False,
-                num_workers=self.num_workers,
+                batch_size=self.val_batch_size,
+                persistent_workers=True,
             )
 
         # Step 2: train the model and freeze it
@@ -282,12 +299,7 @@ class Crossformer(BaseNNImputer):
             return_y=False,
             file_type=file_type,
         )
-        test_loader = DataLoader(
-            test_set,
-            batch_size=self.batch_size,
-            shuffle=False,
-            num_workers=self.num_workers,
-        )
+        test_loader = self._build_loader(test_set, shuffle=False)
         imputation_collector = []
 
         # Step 2: process the data with the model
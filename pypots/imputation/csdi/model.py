@@ -6,17 +6,10 @@ The implementation of CSDI for the partially-observed time-series imputation tas
 # Created by Wenjie Du <wenjay.du@gmail.com>
 # License: BSD-3-Clause
 
-import os
 from typing import Union, Optional
 
 import numpy as np
 import torch
-from torch.utils.data import DataLoader
-
-try:
-    import nni
-except ImportError:
-    pass
 
 from .core import _CSDI
 from .data import DatasetForCSDI, TestDatasetForCSDI
@@ -24,7 +17,6 @@ from ..base import BaseNNImputer
 from ...data.checking import key_in_data_set
 from ...optim.adam import Adam
 from ...optim.base import Optimizer
-from ...utils.logging import logger
 
 
 class CSDI(BaseNNImputer):
@@ -115,8 +107,23 @@ class CSDI(BaseNNImputer):
 
     verbose :
         Whether to print out the training logs during the training process.
+
+    compile_mode :
+        The mode for :func:`torch.compile` to compile the model with during training, has to be one of
+        [None, "default", "reduce-overhead", "max-autotune"]. If None, the model will be trained in eager mode.
+
+    val_batch_size :
+        The batch size for validating the model. If not given, will be the same as ``batch_size``.
+
+    use_amp :
+        Whether to train the model with automatic mixed precision (AMP).
+
+    amp_dtype :
+        The lower-precision dtype used by AMP, torch.bfloat16 or torch.float16.
     """
 
+    _val_loss_name = "validating_loss"
+
     def __init__(
         self,
         n_steps: int,
@@ -142,6 +149,10 @@ class CSDI(BaseNNImputer):
         saving_path: Optional[str] = None,
         model_saving_strategy: Optional[str] = "best",
         verbose: bool = True,
+        compile_mode: Optional[str] = None,
+        val_batch_size: Optional[int] = None,
+        use_amp: bool = False,
+        amp_dtype: torch.dtype = torch.bfloat16,
     ):
         super().__init__(
             batch_size,
@@ -152,6 +163,10 @@ class CSDI(BaseNNImputer):
             saving_path,
             model_saving_strategy,
             verbose,
+            compile_mode,
+            val_batch_size,
+            use_amp,
+            amp_dtype,
         )
         assert target_strategy in ["mix", "random"]
         assert schedule in ["quad", "linear"]
@@ -215,120 +230,14 @@ class CSDI(BaseNNImputer):
         }
         return inputs
 
-    def _train_model(
+    def _calc_val_loss(
         self,
-        training_loader: DataLoader,
-        val_loader: DataLoader = None,
-    ) -> None:
-        # each training starts from the very beginning, so reset the loss and model dict here
-        self.best_loss = float("inf")
-        self.best_model_dict = None
-
-        try:
-            training_step = 0
-            for epoch in range(1, self.epochs + 1):
-                self.model.train()
-                epoch_train_loss_collector = []
-                for idx, data in enumerate(training_loader):
-                    training_step += 1
-                    inputs = self._assemble_input_for_training(data)
-                    self.optimizer.zero_grad()
-                    results = self.model.forward(inputs)
-                    # use sum() before backward() in case of multi-gpu training
-                    results["loss"].sum().backward()
-                    self.optimizer.step()
-                    epoch_train_loss_collector.append(results["loss"].sum().item())
-
-                    # save training loss logs into the tensorboard file for every step if in need
-                    if self.summary_writer is not None:
-                        self._save_log_into_tb_file(training_step, "training", results)
-
-                # mean training loss of the current epoch
-                mean_train_loss = np.mean(epoch_train_loss_collector)
-
-                if val_loader is not None:
-                    self.model.eval()
-                    val_loss_collector = []
-                    with torch.no_grad():
-                        for idx, data in enumerate(val_loader):
-                            inputs = self._assemble_input_for_validating(data)
-                            results = self.model.forward(
-                                inputs, training=False, n_sampling_times=0
-                            )
-                            val_loss_collector.append(results["loss"].sum().item())
-
-                    mean_val_loss = np.asarray(val_loss_collector).mean()
-
-                    # save validation loss logs into the tensorboard file for every epoch if in need
-                    if self.summary_writer is not None:
-                        val_loss_dict = {
-                            "validating_loss": mean_val_loss,
-                        }
-                        self._save_log_into_tb_file(epoch, "validating", val_loss_dict)
-
-                    logger.info(
-                        f"Epoch {epoch:03d} - "
-                        f"training loss: {mean_train_loss:.4f}, "
-                        f"validation loss: {mean_val_loss:.4f}"
-                    )
-                    mean_loss = mean_val_loss
-                else:
-                    logger.info(
-                        f"Epoch {epoch:03d} - training loss: {mean_train_loss:.4f}"
-                    )
-                    mean_loss = mean_train_loss
-
-                if np.isnan(mean_loss):
-                    logger.warning(
-                        f"‼️ Attention: got NaN loss in Epoch {epoch}. This may lead to unexpected errors."
-                    )
-
-                if mean_loss < self.best_loss:
-                    self.best_epoch = epoch
-                    self.best_loss = mean_loss
-                    self.best_model_dict = self.model.state_dict()
-                    self.patience = self.original_patience
-                else:
-                    self.patience -= 1
-
-                # save the model if necessary
-                self._auto_save_model_if_necessary(
-                    confirm_saving=self.best_epoch == epoch,
-                    saving_name=f"{self.__class__.__name__}_epoch{epoch}_loss{mean_loss}",
-                )
-
-                if os.getenv("enable_tuning", False):
-                    nni.report_intermediate_result(mean_loss)
-                    if epoch == self.epochs - 1 or self.patience == 0:
-                        nni.report_final_result(self.best_loss)
-
-                if self.patience == 0:
-                    logger.info(
-                        "Exceeded the training patience. Terminating the training procedure..."
-                    )
-                    break
-
-        except KeyboardInterrupt:  # if keyboard interrupt, only warning
-            logger.warning("‼️ Training got interrupted by the user. Exist now ...")
-        except Exception as e:  # other kind of exception follows below processing
-            logger.error(f"❌ Exception: {e}")
-            if self.best_model_dict is None:  # if no best model, raise error
-                raise RuntimeError(
-                    "Training got interrupted. Model was not trained. Please investigate the error printed above."
-                )
-            else:
-                RuntimeWarning(
-                    "Training got interrupted. Please investigate the error printed above.\n"
-                    "Model got trained and will load the best checkpoint so far for testing.\n"
-                    "If you don't want it, please try fit() again."
-                )
-
-        if np.isnan(self.best_loss):
-            raise ValueError("Something is wrong. best_loss is Nan after training.")
-
-        logger.info(
-            f"Finished training. The best model is from epoch#{self.best_epoch}."
-        )
+        model: torch.nn.Module,
+        inputs: dict,
+    ) -> torch.Tensor:
+        # CSDI is validated with its diffusion loss, and imputing with sampling is too slow for validating
+        results = model.forward(inputs, training=False, n_sampling_times=0)
+        return results["loss"].sum()
 
     def fit(
         self,
@@ -344,11 +253,8 @@ class CSDI(BaseNNImputer):
             return_X_ori=False,
             file_type=file_type,
         )
-        training_loader = DataLoader(
-            training_set,
-            batch_size=self.batch_size,
-            shuffle=True,
-            num_workers=self.num_workers,
+        training_loader = self._build_loader(
+            training_set, shuffle=True, persistent_workers=True
         )
         val_loader = None
         if val_set is not None:
@@ -360,11 +266,11 @@ class CSDI(BaseNNImputer):
                 return_X_ori=True,
                 file_type=file_type,
             )
-            val_loader = DataLoader(
+            val_loader = self._build_loader(
                 val_set,
-                batch_size=self.batch_size,
                 shuffle=False,
-                num_workers=self.num_workers,
+                batch_size=self.val_batch_size,
+                persistent_workers=True,
             )
 
         # Step 2: train the model and freeze it
@@ -412,12 +318,7 @@ class CSDI(BaseNNImputer):
         # Step 1: wrap the input data with classes Dataset and DataLoader
         self.model.eval()  # set the model as eval status to freeze it.
         test_set = TestDatasetForCSDI(test_set, return_X_ori=False, file_type=file_type)
-        test_loader = DataLoader(
-            test_set,
-            batch_size=self.batch_size,
-            shuffle=False,
-            num_workers=self.num_workers,
-        )
+        test_loader = self._build_loader(test_set, shuffle=False)
         imputation_collector = []
 
         # Step 2: process the data with the model
@@ -7,18 +7,10 @@ The implementation of GP-VAE for the partially-observed time-series imputation t
 # License: BSD-3-Clause
 
 
-import os
 from typing import Union, Optional
 
 import numpy as np
 import torch
-from torch.utils.data import DataLoader
-
-try:
-    import nni
-except ImportError:
-    pass
-
 
 from .core import _GPVAE
 from .data import DatasetForGPVAE
@@ -26,7 +18,6 @@ from ..base import BaseNNImputer
 from ...data.checking import key_in_data_set
 from ...optim.adam import Adam
 from ...optim.base import Optimizer
-from ...utils.logging import logger
 from ...utils.metrics import calc_mse
 
 
@@ -112,6 +103,19 @@ class GPVAE(BaseNNImputer):
         The "better" strategy will automatically save the model during training whenever the model performs
         better than in previous epochs.
 
+    compile_mode : str
+        The mode for :func:`torch.compile` to compile the model with during training, has to be one of
+        [None, "default", "reduce-overhead", "max-autotune"]. If None, the model will be trained in eager mode.
+
+    val_batch_size : int
+        The batch size for validating the model. If not given, will be the same as ``batch_size``.
+
+    use_amp : bool
+        Whether to train the model with automatic mixed precision (AMP).
+
+    amp_dtype : torch.dtype
+        The lower-precision dtype used by AMP, torch.bfloat16 or torch.float16.
+
     """
 
     def __init__(
@@ -138,6 +142,10 @@ class GPVAE(BaseNNImputer):
         saving_path: str = None,
         model_saving_strategy: Optional[str] = "best",
         verbose: bool = True,
+        compile_mode: Optional[str] = None,
+        val_batch_size: Optional[int] = None,
+        use_amp: bool = False,
+        amp_dtype: torch.dtype = torch.bfloat16,
     ):
         super().__init__(
             batch_size,
@@ -148,6 +156,10 @@ class GPVAE(BaseNNImputer):
             saving_path,
             model_saving_strategy,
             verbose,
+            compile_mode,
+            val_batch_size,
+            use_amp,
+            amp_dtype,
         )
         available_kernel_type = ["cauchy", "diffusion", "rbf", "matern"]
         assert (
@@ -231,131 +243,19 @@ class GPVAE(BaseNNImputer):
     def _assemble_input_for_testing(self, data: list) -> dict:
         return self._assemble_input_for_training(data)
 
-    def _train_model(
+    def _calc_val_loss(
         self,
-        training_loader: DataLoader,
-        val_loader: DataLoader = None,
-    ) -> None:
-        # each training starts from the very beginning, so reset the loss and model dict here
-        self.best_loss = float("inf")
-        self.best_model_dict = None
-
-        try:
-            training_step = 0
-            for epoch in range(1, self.epochs + 1):
-                self.model.train()
-                epoch_train_loss_collector = []
-                for idx, data in enumerate(training_loader):
-                    training_step += 1
-                    inputs = self._assemble_input_for_training(data)
-                    self.optimizer.zero_grad()
-                    results = self.model.forward(inputs)
-                    # use sum() before backward() in case of multi-gpu training
-                    results["loss"].sum().backward()
-                    self.optimizer.step()
-                    epoch_train_loss_collector.append(results["loss"].sum().item())
-
-                    # save training loss logs into the tensorboard file for every step if in need
-                    if self.summary_writer is not None:
-                        self._save_log_into_tb_file(training_step, "training", results)
-
-                # mean training loss of the current epoch
-                mean_train_loss = np.mean(epoch_train_loss_collector)
-
-                if val_loader is not None:
-                    self.model.eval()
-                    imputation_loss_collector = []
-                    with torch.no_grad():
-                        for idx, data in enumerate(val_loader):
-                            inputs = self._assemble_input_for_validating(data)
-                            results = self.model.forward(
-                                inputs, training=False, n_sampling_times=1
-                            )
-                            imputed_data = results["imputed_data"].mean(axis=1)
-                            imputation_mse = (
-                                calc_mse(
-                                    imputed_data,
-                                    inputs["X_ori"],
-                                    inputs["indicating_mask"],
-                                )
-                                .sum()
-                                .detach()
-                                .item()
-                            )
-                            imputation_loss_collector.append(imputation_mse)
-
-                    mean_val_loss = np.mean(imputation_loss_collector)
-
-                    # save validation loss logs into the tensorboard file for every epoch if in need
-                    if self.summary_writer is not None:
-                        val_loss_dict = {
-                            "imputation_loss": mean_val_loss,
-                        }
-                        self._save_log_into_tb_file(epoch, "validating", val_loss_dict)
-
-                    logger.info(
-                        f"Epoch {epoch:03d} - "
-                        f"training loss: {mean_train_loss:.4f}, "
-                        f"validation loss: {mean_val_loss:.4f}"
-                    )
-                    mean_loss = mean_val_loss
-                else:
-                    logger.info(
-                        f"Epoch {epoch:03d} - training loss: {mean_train_loss:.4f}"
-                    )
-                    mean_loss = mean_train_loss
-
-                if np.isnan(mean_loss):
-                    logger.warning(
-                        f"‼️ Attention: got NaN loss in Epoch {epoch}. This may lead to unexpected errors."
-                    )
-
-                if mean_loss < self.best_loss:
-                    self.best_epoch = epoch
-                    self.best_loss = mean_loss
-                    self.best_model_dict = self.model.state_dict()
-                    self.patience = self.original_patience
-                else:
-                    self.patience -= 1
-
-                # save the model if necessary
-                self._auto_save_model_if_necessary(
-                    confirm_saving=self.best_epoch == epoch,
-                    saving_name=f"{self.__class__.__name__}_epoch{epoch}_loss{mean_loss}",
-                )
-
-                if os.getenv("enable_tuning", False):
-                    nni.report_intermediate_result(mean_loss)
-                    if epoch == self.epochs - 1 or self.patience == 0:
-                        nni.report_final_result(self.best_loss)
-
-                if self.patience == 0:
-                    logger.info(
-                        "Exceeded the training patience. Terminating the training procedure..."
-                    )
-                    break
-
-        except KeyboardInterrupt:  # if keyboard interrupt, only warning
-            logger.warning("‼️ Training got interrupted by the user. Exist now ...")
-        except Exception as e:  # other kind of exception follows below processing
-            logger.error(f"❌ Exception: {e}")
-            if self.best_model_dict is None:  # if no best model, raise error
-                raise RuntimeError(
-                    "Training got interrupted. Model was not trained. Please investigate the error printed above."
-                )
-            else:
-                RuntimeWarning(
-                    "Training got interrupted. Please investigate the error printed above.\n"
-                    "Model got trained and will load the best checkpoint so far for testing.\n"
-                    "If you don't want it, please try fit() again."
-                )
-
-        if np.isnan(self.best_loss):
-            raise ValueError("Something is wrong. best_loss is Nan after training.")
-
-        logger.info(
-            f"Finished training. The best model is from epoch#{self.best_epoch}."
-        )
+        model: torch.nn.Module,
+        inputs: dict,
+    ) -> torch.Tensor:
+        results = model.forward(inputs, training=False, n_sampling_times=1)
+        imputed_data = results["imputed_data"].mean(axis=1)
+        imputation_mse = calc_mse(
+            imputed_data,
+            inputs["X_ori"],
+            inputs["indicating_mask"],
+        ).sum()
+        return imputation_mse
 
     def fit(
         self,
@@ -367,11 +267,8 @@ class GPVAE(BaseNNImputer):
         training_set = DatasetForGPVAE(
             train_set, return_X_ori=False, return_y=False, file_type=file_type
         )
-        training_loader = DataLoader(
-            training_set,
-            batch_size=self.batch_size,
-            shuffle=True,
-            num_workers=self.num_workers,
+        training_loader = self._build_loader(
+            training_set, shuffle=True, persistent_workers=True
         )
         val_loader = None
         if val_set is not None:
@@ -380,11 +277,11 @@ class GPVAE(BaseNNImputer):
             val_set = DatasetForGPVAE(
                 val_set, return_X_ori=True, return_y=False, file_type=file_type
             )
-            val_loader = DataLoader(
+            val_loader = self._build_loader(
                 val_set,
-                batch_size=self.batch_size,
                 shuffle=False,
-                num_workers=self.num_workers,
+                batch_size=self.val_batch_size,
+                persistent_workers=True,
             )
 
         # Step 2: train the model and freeze it
@@ -433,12 +330,7 @@ class GPVAE(BaseNNImputer):
         test_set = DatasetForGPVAE(
             test_set, return_X_ori=False, return_y=False, file_type=file_type
         )
-        test_loader = DataLoader(
-            test_set,
-            batch_size=self.batch_size,
-            shuffle=False,
-            num_workers=self.num_workers,
-        )
+        test_loader = self._build_loader(test_set, shuffle=False)
         imputation_collector = []
 
         with torch.no_grad():
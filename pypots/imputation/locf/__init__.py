@@ -5,7 +5,8 @@ The package of the partially-observed time-series imputation method LOCF.
 # Created by Wenjie Du <wenjay.du@gmail.com>
 # License: BSD-3-Clause
 
-from .model import LOCF, locf_numpy, locf_torch
+from .core import locf_numpy, locf_torch
+from .model import LOCF
 
 __all__ = [
     "LOCF",
@@ -0,0 +1,56 @@
+"""
+The Numba JIT-compiled kernels of LOCF. Numba is an optional dependency, and these kernels are used by
+:class:`pypots.imputation.LOCF` only if Numba is installed and the input data is large enough.
+"""
+
+# License: BSD-3-Clause
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit, prange
+
+
+# fastmath is not enabled because it assumes no NaN in the data, which would break np.isnan() checks here
+@njit(parallel=True, cache=True)
+def locf_forward(X, out):
+    """Carry the last observed values forward in a single sweep over each sample, leaving the missing values
+    before the first observation as NaNs.
+
+    Parameters
+    ----------
+    X : np.ndarray,
+        Time series containing missing values (NaN) to be imputed, of shape [n_samples, n_steps, n_features].
+
+    out : np.ndarray,
+        The array to write the forward-filled results into, of the same shape and dtype as X.
+
+    """
+    n_samples, n_steps, n_features = X.shape
+    for i in prange(n_samples):
+        last = np.empty(n_features, dtype=X.dtype)
+        last[:] = np.nan
+        for t in range(n_steps):
+            for f in range(n_features):
+                v = X[i, t, f]
+                if not np.isnan(v):
+                    last[f] = v
+                out[i, t, f] = last[f]
+
+
+def forward_fill_numba(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Numba version of :func:`pypots.imputation.locf.core._forward_fill_numpy`.
+
+    Returns
+    -------
+    X_filled : array,
+        The forward-filled time series.
+
+    leading_missing : array,
+        The boolean mask of the values still missing in ``X_filled``.
+    """
+    X = np.ascontiguousarray(X)
+    X_filled = np.empty_like(X)
+    locf_forward(X, X_filled)
+    leading_missing = np.isnan(X_filled)
+    return X_filled, leading_missing
@@ -5,6 +5,8 @@ The core wrapper assembles the submodules of LOCF imputation model.
 # Created by Wenjie Du <wenjay.du@gmail.com>
 # License: BSD-3-Clause
 
+from typing import Tuple
+
 import numpy as np
 import torch
 
@@ -46,42 +48,10 @@ def locf_numpy(
     https://stackoverflow.com/questions/41190852/most-efficient-way-to-forward-fill-nan-values-in-numpy-array
 
     """
-    trans_X = X.transpose((0, 2, 1))
-    mask = np.isnan(trans_X)
-    n_samples, n_steps, n_features = mask.shape
-    idx = np.where(~mask, np.arange(n_features), 0)
-    idx = np.maximum.accumulate(idx, axis=2)
-
-    collector = []
-    for x, i in zip(trans_X, idx):
-        collector.append(x[np.arange(n_steps)[:, None], i])
-    X_imputed = np.asarray(collector)
-    X_imputed = X_imputed.transpose((0, 2, 1))
-
-    # If there are values still missing, they are missing at the beginning of the time-series sequence.
-    if np.isnan(X_imputed).any():
-        if first_step_imputation == "nan":
-            pass
-        elif first_step_imputation == "zero":
-            X_imputed = np.nan_to_num(X_imputed, nan=0)
-        elif first_step_imputation == "backward":
-            # imputed by last observation carried backward (LOCB)
-            X_imputed_transpose = np.copy(X_imputed)
-            X_imputed_transpose = np.flip(X_imputed_transpose, axis=1)
-            X_LOCB = locf_numpy(
-                X_imputed_transpose,
-                "zero",
-            )
-            X_imputed = np.flip(X_LOCB, axis=1)
-        elif first_step_imputation == "median":
-            bz, n_steps, n_features = X_imputed.shape
-            X_imputed_reshaped = np.copy(X_imputed).reshape(-1, n_features)
-            median_values = np.nanmedian(X_imputed_reshaped, axis=0)
-            for i, v in enumerate(median_values):
-                X_imputed[:, :, i] = np.nan_to_num(X_imputed[:, :, i], nan=v)
-            if np.isnan(X_imputed).any():
-                X_imputed = np.nan_to_num(X_imputed, nan=0)
-
+    X_filled, leading_missing = _forward_fill_numpy(X)
+    X_imputed = _apply_first_step_numpy(
+        X_filled, leading_missing, first_step_imputation
+    )
     return X_imputed
 
 
@@ -116,40 +86,112 @@ def locf_torch(
     X_imputed : tensor,
         Imputed time series.
     """
-    trans_X = X.permute((0, 2, 1))
-    mask = torch.isnan(trans_X)
-    n_samples, n_steps, n_features = mask.shape
-    idx = torch.where(~mask, torch.arange(n_features, device=mask.device), 0)
-    idx = np.maximum.accumulate(idx, axis=2)
-
-    collector = []
-    for x, i in zip(trans_X, idx):
-        collector.append(x[torch.arange(n_steps)[:, None], i])
-    X_imputed = torch.stack(collector)
-    X_imputed = X_imputed.permute((0, 2, 1))
-
-    # If there are values still missing, they are missing at the beginning of the time-series sequence.
-    if torch.isnan(X_imputed).any():
-        if first_step_imputation == "nan":
-            pass
-        elif first_step_imputation == "zero":
-            X_imputed = torch.nan_to_num(X_imputed, nan=0)
-        elif first_step_imputation == "backward":
-            # imputed by last observation carried backward (LOCB)
-            X_imputed_transpose = X_imputed.clone()
-            X_imputed_transpose = torch.flip(X_imputed_transpose, dims=[1])
-            X_LOCB = locf_torch(
-                X_imputed_transpose,
-                "zero",
-            )
-            X_imputed = torch.flip(X_LOCB, dims=[1])
-        elif first_step_imputation == "median":
-            bz, n_steps, n_features = X_imputed.shape
-            X_imputed_reshaped = X_imputed.clone().reshape(-1, n_features)
-            median_values = torch.nanmedian(X_imputed_reshaped, dim=0)
-            for i, v in enumerate(median_values.values):
-                X_imputed[:, :, i] = torch.nan_to_num(X_imputed[:, :, i], nan=v)
-            if torch.isnan(X_imputed).any():
-                X_imputed = torch.nan_to_num(X_imputed, nan=0)
+    X_filled, leading_missing = _forward_fill_torch(X)
+    X_imputed = _apply_first_step_torch(
+        X_filled, leading_missing, first_step_imputation
+    )
+    return X_imputed
+
+
+def _forward_fill_numpy(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Carry the last observed values forward, leaving the missing values at the sequence beginning as NaNs.
+
+    Returns
+    -------
+    X_filled : array,
+        The forward-filled time series.
+
+    leading_missing : array,
+        The boolean mask of the values still missing in ``X_filled``,
+        i.e. the ones before the first observation of each feature in each sample.
+    """
+    X = np.ascontiguousarray(X)
+    n_samples, n_steps, n_features = X.shape
+    mask = ~np.isnan(X)
+    # the index of the last observed step for each position, 0 if nothing observed so far
+    idx = np.where(mask, np.arange(n_steps)[None, :, None], 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    X_filled = np.take_along_axis(X, idx, axis=1)
+    leading_missing = np.isnan(X_filled)
+    return X_filled, leading_missing
+
+
+def _apply_first_step_numpy(
+    X_filled: np.ndarray,
+    leading_missing: np.ndarray,
+    first_step_imputation: str,
+) -> np.ndarray:
+    """Impute the missing values at the sequence beginning of the forward-filled time series with the given strategy.
+    ``X_filled`` is not modified in place, so the result of :func:`_forward_fill_numpy` can be reused for all
+    strategies, but it may be returned as it is if no imputation happens.
+    """
+    if not leading_missing.any() or first_step_imputation == "nan":
+        return X_filled
+
+    if first_step_imputation == "zero":
+        X_imputed = np.where(leading_missing, 0, X_filled)
+    elif first_step_imputation == "backward":
+        # imputed by next observation carried backward (NOCB), i.e. the first observed value
+        first_observed_idx = (~leading_missing).argmax(axis=1)[:, None, :]
+        first_observed = np.take_along_axis(X_filled, first_observed_idx, axis=1)
+        # the features without any observation are still NaN here, fill them with 0
+        first_observed = np.nan_to_num(first_observed, nan=0)
+        X_imputed = np.where(leading_missing, first_observed, X_filled)
+    elif first_step_imputation == "median":
+        n_features = X_filled.shape[-1]
+        median_values = np.nanmedian(X_filled.reshape(-1, n_features), axis=0)
+        # the features without any observation in the whole dataset are filled with 0
+        median_values = np.nan_to_num(median_values, nan=0)
+        X_imputed = np.where(leading_missing, median_values, X_filled)
+    else:
+        raise ValueError(
+            f"first_step_imputation should be one of ['backward', 'zero', 'median', 'nan'], "
+            f"but got {first_step_imputation}"
+        )
+
+    return X_imputed
+
+
+def _forward_fill_torch(X: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Torch version of :func:`_forward_fill_numpy`."""
+    n_samples, n_steps, n_features = X.shape
+    mask = ~torch.isnan(X)
+    # the index of the last observed step for each position, 0 if nothing observed so far
+    idx = torch.where(mask, torch.arange(n_steps, device=X.device)[None, :, None], 0)
+    idx = torch.cummax(idx, dim=1).values
+    X_filled = torch.gather(X, 1, idx)
+    leading_missing = torch.isnan(X_filled)
+    return X_filled, leading_missing
+
+
+def _apply_first_step_torch(
+    X_filled: torch.Tensor,
+    leading_missing: torch.Tensor,
+    first_step_imputation: str,
+) -> torch.Tensor:
+    """Torch version of :func:`_apply_first_step_numpy`."""
+    if not leading_missing.any() or first_step_imputation == "nan":
+        return X_filled
+
+    if first_step_imputation == "zero":
+        X_imputed = X_filled.masked_fill(leading_missing, 0)
+    elif first_step_imputation == "backward":
+        # imputed by next observation carried backward (NOCB), i.e. the first observed value
+        first_observed_idx = (~leading_missing).int().argmax(dim=1, keepdim=True)
+        first_observed = torch.gather(X_filled, 1, first_observed_idx)
+        # the features without any observation are still NaN here, fill them with 0
+        first_observed = torch.nan_to_num(first_observed, nan=0)
+        X_imputed = torch.where(leading_missing, first_observed, X_filled)
+    elif first_step_imputation == "median":
+        n_features = X_filled.shape[-1]
+        median_values = torch.nanmedian(X_filled.reshape(-1, n_features), dim=0).values
+        # the features without any observation in the whole dataset are filled with 0
+        median_values = torch.nan_to_num(median_values, nan=0)
+        X_imputed = torch.where(leading_missing, median_values, X_filled)
+    else:
+        raise ValueError(
+            f"first_step_imputation should be one of ['backward', 'zero', 'median', 'nan'], "
+            f"but got {first_step_imputation}"
+        )
 
     return X_imputed
@@ -7,15 +7,31 @@ The implementation of LOCF (Last Observed Carried Forward) for the partially-obs
 # License: BSD-3-Clause
 
 import warnings
-from typing import Union, Optional
+from typing import Union, Optional, Tuple
 
 import h5py
 import numpy as np
 import torch
 
-from .core import locf_numpy, locf_torch
+from .core import (
+    _forward_fill_numpy,
+    _forward_fill_torch,
+    _apply_first_step_numpy,
+    _apply_first_step_torch,
+)
 from ..base import BaseImputer
 
+try:
+    from ._numba_kernels import forward_fill_numba
+except ImportError:
+    # Numba is optional, and LOCF falls back to the NumPy implementation without it
+    forward_fill_numba = None
+
+# the minimum number of elements in X to forward fill with Numba. Numba is ~10x faster than NumPy, but the kernel gets
+# JIT-compiled at its first call in a fresh environment (~1.5s) and loaded from the cache in every new process,
+# which doesn't pay off for small data that NumPy can process in tens of milliseconds
+_NUMBA_MIN_N_ELEMENTS = 2**24
+
 
 class LOCF(BaseImputer):
     """LOCF (Last Observed Carried Forward) imputation method. A naive imputation method that fills missing values
@@ -63,12 +79,97 @@ class LOCF(BaseImputer):
         LOCF does not need to run fit().
         Please run func ``predict()`` directly.
 
+        Notes
+        -----
+        Only the shapes of X in the given datasets get checked here. If they are path strings, only the metadata of
+        the files will be read, and the data won't be loaded.
+
         """
         warnings.warn(
             "LOCF (Last Observed Carried Forward) imputation class has no parameter to train. "
             "Please run func `predict()` directly."
         )
 
+        for dataset in [train_set, val_set]:
+            if dataset is None:
+                continue
+            if isinstance(dataset, str):
+                with h5py.File(dataset, "r") as f:
+                    X_shape = f["X"].shape
+            else:
+                X_shape = np.shape(dataset["X"])
+            assert len(X_shape) == 3, (
+                f"Input X should have 3 dimensions [n_samples, n_steps, n_features], "
+                f"but the actual shape of X: {X_shape}"
+            )
+
+    @staticmethod
+    def _forward_fill(
+        X: Union[np.ndarray, torch.Tensor],
+    ) -> Tuple[Union[np.ndarray, torch.Tensor], Union[np.ndarray, torch.Tensor]]:
+        """Carry the last observed values forward, leaving the missing values at the sequence beginning as NaNs.
+        This is the common part of LOCF for all ``first_step_imputation`` strategies.
+
+        Parameters
+        ----------
+        X :
+            Time series containing missing values (NaN) to be imputed, of shape [n_samples, n_steps, n_features].
+
+        Returns
+        -------
+        X_filled :
+            The forward-filled time series.
+
+        leading_missing :
+            The boolean mask of the values still missing in ``X_filled``.
+        """
+        if isinstance(X, np.ndarray):
+            if (
+                forward_fill_numba is not None
+                and X.size >= _NUMBA_MIN_N_ELEMENTS
+                and np.issubdtype(X.dtype, np.floating)
+            ):
+                return forward_fill_numba(X)
+            return _forward_fill_numpy(X)
+        elif isinstance(X, torch.Tensor):
+            return _forward_fill_torch(X)
+        else:
+            raise TypeError(
+                "X must be type of list/np.ndarray/torch.Tensor, " f"but got {type(X)}"
+            )
+
+    @staticmethod
+    def _apply_first_step(
+        X_filled: Union[np.ndarray, torch.Tensor],
+        leading_missing: Union[np.ndarray, torch.Tensor],
+        first_step_imputation: str,
+    ) -> Union[np.ndarray, torch.Tensor]:
+        """Impute the missing values at the sequence beginning of the result from :func:`_forward_fill` with
+        the given strategy. ``X_filled`` won't be modified in place, so it can be reused for different strategies.
+
+        Parameters
+        ----------
+        X_filled :
+            The forward-filled time series.
+
+        leading_missing :
+            The boolean mask of the values still missing in ``X_filled``.
+
+        first_step_imputation :
+            The strategy to impute the missing values at the sequence beginning,
+            one of ['backward', 'zero', 'median', 'nan'].
+
+        Returns
+        -------
+        X_imputed :
+            Imputed time series.
+        """
+        if isinstance(X_filled, np.ndarray):
+            return _apply_first_step_numpy(
+                X_filled, leading_missing, first_step_imputation
+            )
+        return _apply_first_step_torch(X_filled, leading_missing, first_step_imputation)
+
     def predict(
         self,
         test_set: Union[dict, str],
@@ -103,21 +204,18 @@ class LOCF(BaseImputer):
         else:
             X = test_set["X"]
 
+        if isinstance(X, list):
+            X = np.asarray(X)
+
         assert len(X.shape) == 3, (
             f"Input X should have 3 dimensions [n_samples, n_steps, n_features], "
             f"but the actual shape of X: {X.shape}"
         )
-        if isinstance(X, list):
-            X = np.asarray(X)
 
-        if isinstance(X, np.ndarray):
-            imputed_data = locf_numpy(X, self.first_step_imputation)
-        elif isinstance(X, torch.Tensor):
-            imputed_data = locf_torch(X, self.first_step_imputation)
-        else:
-            raise TypeError(
-                "X must be type of list/np.ndarray/torch.Tensor, " f"but got {type(X)}"
-            )
+        X_filled, leading_missing = self._forward_fill(X)
+        imputed_data = self._apply_first_step(
+            X_filled, leading_missing, self.first_step_imputation
+        )
 
         result_dict = {
             "imputation": imputed_data,
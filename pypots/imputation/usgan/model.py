@@ -20,7 +20,6 @@ from ...data.checking import key_in_data_set
 from ...optim.adam import Adam
 from ...optim.base import Optimizer
 from ...utils.logging import logger
-from ...utils.metrics import calc_mse
 
 try:
     import nni
@@ -99,6 +98,9 @@ class USGAN(BaseNNImputer):
         The "better" strategy will automatically save the model during training whenever the model performs
         better than in previous epochs.
 
+    val_batch_size : int
+        The batch size for validating the model. If not given, will be the same as ``batch_size``.
+
     """
 
     def __init__(
@@ -121,6 +123,7 @@ class USGAN(BaseNNImputer):
         saving_path: Optional[str] = None,
         model_saving_strategy: Optional[str] = "best",
         verbose: bool = True,
+        val_batch_size: Optional[int] = None,
     ):
         super().__init__(
             batch_size,
@@ -131,6 +134,7 @@ class USGAN(BaseNNImputer):
             saving_path,
             model_saving_strategy,
             verbose,
+            val_batch_size=val_batch_size,
         )
         assert G_steps > 0 and D_steps > 0, "G_steps and D_steps should both >0"
 
@@ -284,17 +288,9 @@ class USGAN(BaseNNImputer):
                     with torch.no_grad():
                         for idx, data in enumerate(val_loader):
                             inputs = self._assemble_input_for_validating(data)
-                            results = self.model.forward(inputs, training=False)
-                            imputation_mse = (
-                                calc_mse(
-                                    results["imputed_data"],
-                                    inputs["X_ori"],
-                                    inputs["indicating_mask"],
-                                )
-                                .sum()
-                                .detach()
-                                .item()
-                            )
+                            imputation_mse = self._calc_val_loss(
+                                self.model, inputs
+                            ).item()
                             imputation_loss_collector.append(imputation_mse)
 
                     mean_val_loss = np.mean(imputation_loss_collector)
@@ -327,7 +323,7 @@ class USGAN(BaseNNImputer):
                 if mean_loss < self.best_loss:
                     self.best_epoch = epoch
                     self.best_loss = mean_loss
-                    self.best_model_dict = self.model.state_dict()
+                    self._update_best_model_dict()
                     self.patience = self.original_patience
                 else:
                     self.patience -= 1
@@ -367,6 +363,9 @@ class USGAN(BaseNNImputer):
         if np.isnan(self.best_loss):
             raise ValueError("Something is wrong. best_loss is Nan after training.")
 
+        # make sure the asynchronous copies into self.best_model_dict are finished
+        self._synchronize_device()
+
         logger.info(
             f"Finished training. The best model is from epoch#{self.best_epoch}."
         )
@@ -381,11 +380,8 @@ class USGAN(BaseNNImputer):
         training_set = DatasetForUSGAN(
             train_set, return_X_ori=False, return_y=False, file_type=file_type
         )
-        training_loader = DataLoader(
-            training_set,
-            batch_size=self.batch_size,
-            shuffle=True,
-            num_workers=self.num_workers,
+        training_loader = self._build_loader(
+            training_set, shuffle=True, persistent_workers=True
         )
         val_loader = None
         if val_set is not None:
@@ -394,11 +390,11 @@ class USGAN(BaseNNImputer):
             val_set = DatasetForUSGAN(
                 val_set, return_X_ori=True, return_y=False, file_type=file_type
             )
-            val_loader = DataLoader(
+            val_loader = self._build_loader(
                 val_set,
-                batch_size=self.batch_size,
                 shuffle=False,
-                num_workers=self.num_workers,
+                batch_size=self.val_batch_size,
+                persistent_workers=True,
             )
 
         # Step 2: train the model and freeze it
@@ -418,12 +414,7 @@ class USGAN(BaseNNImputer):
         test_set = DatasetForUSGAN(
             test_set, return_X_ori=False, return_y=False, file_type=file_type
         )
-        test_loader = DataLoader(
-            test_set,
-            batch_size=self.batch_size,
-            shuffle=False,
-            num_workers=self.num_workers,
-        )
+        test_loader = self._build_loader(test_set, shuffle=False)
         imputation_collector = []
 
         with torch.no_grad():
@@ -19,6 +19,8 @@ in one place, which could result in a mess and be not readable;
 from abc import ABC, abstractmethod
 from typing import Callable, Iterable, Optional
 
+import torch
+
 from .lr_scheduler.base import LRScheduler
 
 
@@ -91,7 +93,11 @@ class Optimizer(ABC):
         state_dict = self.torch_optimizer.state_dict()
         return state_dict
 
-    def step(self, closure: Optional[Callable] = None) -> None:
+    def step(
+        self,
+        closure: Optional[Callable] = None,
+        grad_scaler: Optional["torch.amp.GradScaler"] = None,
+    ) -> None:
         """Performs a single optimization step (parameter update).
 
         Parameters
@@ -100,8 +106,20 @@ class Optimizer(ABC):
             A closure that reevaluates the model and returns the loss. Optional for most optimizers.
             Refer to the :class:`torch.optim.Optimizer.step()` docstring for more details.
 
+        grad_scaler :
+            The gradient scaler that scaled the loss in mixed-precision training. If given, the step will be performed
+            through it, i.e. the gradients get unscaled first and the step gets skipped if they contain infs or NaNs,
+            and the scaler will be updated afterwards. It cannot be used together with ``closure``.
+
         """
-        self.torch_optimizer.step(closure)
+        if grad_scaler is None:
+            self.torch_optimizer.step(closure)
+        else:
+            assert (
+                closure is None
+            ), "closure is not supported when grad_scaler is given."
+            grad_scaler.step(self.torch_optimizer)
+            grad_scaler.update()
 
         if self.lr_scheduler is not None:
             self.lr_scheduler.step()
@@ -58,6 +58,14 @@ def _check_inputs(
     return lib
 
 
+def _masked_mean_numpy(errors: np.ndarray, masks: np.ndarray) -> float:
+    """Average ``errors`` over the positions where values ==1 in ``masks``.
+    The multiplication with ``masks`` and the summation are fused into one pass by einsum,
+    so no temporary array of their product gets allocated.
+    """
+    return np.einsum("i,i->", errors.ravel(), masks.ravel()) / (np.sum(masks) + 1e-12)
+
+
 def calc_mae(
     predictions: Union[np.ndarray, torch.Tensor],
     targets: Union[np.ndarray, torch.Tensor],
@@ -104,6 +112,10 @@ def calc_mae(
     lib = _check_inputs(predictions, targets, masks)
 
     if masks is not None:
+        if lib is np:
+            # compute the errors in the buffer of the difference to avoid one more temporary array
+            errors = np.subtract(predictions, targets)
+            return _masked_mean_numpy(np.abs(errors, out=errors), masks)
         return lib.sum(lib.abs(predictions - targets) * masks) / (
             lib.sum(masks) + 1e-12
         )
@@ -157,6 +169,10 @@ def calc_mse(
     lib = _check_inputs(predictions, targets, masks)
 
     if masks is not None:
+        if lib is np:
+            # compute the errors in the buffer of the difference to avoid one more temporary array
+            errors = np.subtract(predictions, targets)
+            return _masked_mean_numpy(np.square(errors, out=errors), masks)
         return lib.sum(lib.square(predictions - targets) * masks) / (
             lib.sum(masks) + 1e-12
         )
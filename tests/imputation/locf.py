@@ -13,6 +13,9 @@ import pytest
 import torch
 
 from pypots.imputation import LOCF
+from pypots.imputation.locf import locf_numpy, locf_torch
+from pypots.imputation.locf.core import _forward_fill_numpy, _forward_fill_torch
+from pypots.imputation.locf.model import forward_fill_numba
 from pypots.utils.logging import logger
 from pypots.utils.metrics import calc_mse
 from tests.global_test_config import (
@@ -27,91 +30,95 @@ from tests.global_test_config import (
 
 class TestLOCF(unittest.TestCase):
     logger.info("Running tests for an imputation model LOCF...")
-    locf_zero = LOCF(first_step_imputation="zero", device=DEVICE)
     locf_backward = LOCF(first_step_imputation="backward", device=DEVICE)
-    locf_median = LOCF(first_step_imputation="median", device=DEVICE)
-    locf_nan = LOCF(first_step_imputation="nan", device=DEVICE)
+
+    @classmethod
+    def setUpClass(cls):
+        # the forward filling is the same for all first_step_imputation strategies,
+        # so run it only once here and apply each strategy on the cached result in the tests
+        cls._filled, cls._leading_missing = LOCF._forward_fill(TEST_SET["X"])
+
+        # the tensors share memory with the arrays without copying because LOCF doesn't modify the input in place
+        cls._X_t = torch.from_numpy(TEST_SET["X"])
+        cls._ori_t = torch.from_numpy(DATA["test_X_ori"])
+        cls._mask_t = torch.from_numpy(DATA["test_X_indicating_mask"])
+        cls._filled_t, cls._leading_missing_t = LOCF._forward_fill(cls._X_t)
 
     @pytest.mark.xdist_group(name="imputation-locf")
     def test_0_impute(self):
-        # if input data is numpy ndarray
-        test_X_imputed_zero = self.locf_zero.predict(TEST_SET)["imputation"]
-        assert not np.isnan(
-            test_X_imputed_zero
-        ).any(), "Output still has missing values after running impute()."
-        test_MSE = calc_mse(
-            test_X_imputed_zero, DATA["test_X_ori"], DATA["test_X_indicating_mask"]
+        # the public path, once for each input type, should give the same results as the cached forward filling
+        test_X_imputed = self.locf_backward.predict(TEST_SET)["imputation"]
+        np.testing.assert_array_equal(
+            test_X_imputed,
+            LOCF._apply_first_step(self._filled, self._leading_missing, "backward"),
         )
-        logger.info(f"LOCF (zero) test_MSE: {test_MSE}")
-
-        test_X_imputed_backward = self.locf_backward.predict(TEST_SET)["imputation"]
-        assert not np.isnan(
-            test_X_imputed_backward
-        ).any(), "Output still has missing values after running impute()."
-        test_MSE = calc_mse(
-            test_X_imputed_backward,
-            DATA["test_X_ori"],
-            DATA["test_X_indicating_mask"],
+        test_X_imputed = self.locf_backward.predict({"X": self._X_t})["imputation"]
+        np.testing.assert_array_equal(
+            test_X_imputed.numpy(),
+            LOCF._apply_first_step(
+                self._filled_t, self._leading_missing_t, "backward"
+            ).numpy(),
         )
-        logger.info(f"LOCF (backward) test_MSE: {test_MSE}")
 
-        test_X_imputed_median = self.locf_median.predict(TEST_SET)["imputation"]
-        assert not np.isnan(
-            test_X_imputed_median
-        ).any(), "Output still has missing values after running impute()."
-        test_MSE = calc_mse(
-            test_X_imputed_median,
-            DATA["test_X_ori"],
-            DATA["test_X_indicating_mask"],
+        # if input data is numpy ndarray
+        for strategy in ["zero", "backward", "median"]:
+            test_X_imputed = LOCF._apply_first_step(
+                self._filled, self._leading_missing, strategy
+            )
+            assert not np.isnan(
+                test_X_imputed
+            ).any(), "Output still has missing values after running impute()."
+            test_MSE = calc_mse(
+                test_X_imputed, DATA["test_X_ori"], DATA["test_X_indicating_mask"]
+            )
+            logger.info(f"LOCF ({strategy}) test_MSE: {test_MSE}")
+
+        test_X_imputed_nan = LOCF._apply_first_step(
+            self._filled, self._leading_missing, "nan"
         )
-        logger.info(f"LOCF (median) test_MSE: {test_MSE}")
-
-        test_X_imputed_nan = self.locf_nan.predict(TEST_SET)["imputation"]
         num_of_missing = np.isnan(test_X_imputed_nan).sum()
         assert num_of_missing > 0, "Output should have missing data but not."
         logger.info(f"LOCF (nan) still have {num_of_missing} missing values.")
 
         # if input data is torch tensor
-        X = torch.from_numpy(np.copy(TEST_SET["X"]))
-        test_X_ori = torch.from_numpy(np.copy(DATA["test_X_ori"]))
-        test_X_indicating_mask = torch.from_numpy(
-            np.copy(DATA["test_X_indicating_mask"])
-        )
-
-        test_X_imputed_zero = self.locf_zero.predict({"X": X})["imputation"]
-        assert not torch.isnan(
-            test_X_imputed_zero
-        ).any(), "Output still has missing values after running impute()."
-        test_MSE = calc_mse(test_X_imputed_zero, test_X_ori, test_X_indicating_mask)
-        logger.info(f"LOCF (zero) test_MSE: {test_MSE}")
-
-        test_X_imputed_backward = self.locf_backward.predict({"X": X})["imputation"]
-        assert not torch.isnan(
-            test_X_imputed_backward
-        ).any(), "Output still has missing values after running impute()."
-        test_MSE = calc_mse(
-            test_X_imputed_backward,
-            test_X_ori,
-            test_X_indicating_mask,
-        )
-        logger.info(f"LOCF (backward) test_MSE: {test_MSE}")
-
-        test_X_imputed_median = self.locf_median.predict({"X": X})["imputation"]
-        assert not torch.isnan(
-            test_X_imputed_median
-        ).any(), "Output still has missing values after running impute()."
-        test_MSE = calc_mse(
-            test_X_imputed_median,
-            test_X_ori,
-            test_X_indicating_mask,
+        for strategy in ["zero", "backward", "median"]:
+            test_X_imputed = LOCF._apply_first_step(
+                self._filled_t, self._leading_missing_t, strategy
+            )
+            assert not torch.isnan(
+                test_X_imputed
+            ).any(), "Output still has missing values after running impute()."
+            test_MSE = calc_mse(test_X_imputed, self._ori_t, self._mask_t)
+            logger.info(f"LOCF ({strategy}) test_MSE: {test_MSE}")
+
+        test_X_imputed_nan = LOCF._apply_first_step(
+            self._filled_t, self._leading_missing_t, "nan"
         )
-        logger.info(f"LOCF (median) test_MSE: {test_MSE}")
-
-        test_X_imputed_nan = self.locf_nan.predict({"X": X})["imputation"]
-        num_of_missing = torch.isnan(test_X_imputed_nan).sum()
+        num_of_missing = torch.isnan(test_X_imputed_nan).sum().item()
         assert num_of_missing > 0, "Output should have missing data but not."
         logger.info(f"LOCF (nan) still have {num_of_missing} missing values.")
 
+    @pytest.mark.xdist_group(name="imputation-locf")
+    def test_1_backends(self):
+        X = TEST_SET["X"]
+        X_filled, leading_missing = _forward_fill_numpy(X)
+
+        X_filled_t, leading_missing_t = _forward_fill_torch(self._X_t)
+        np.testing.assert_array_equal(X_filled_t.numpy(), X_filled)
+        np.testing.assert_array_equal(leading_missing_t.numpy(), leading_missing)
+
+        if forward_fill_numba is not None:
+            X_filled_nb, leading_missing_nb = forward_fill_numba(X)
+            np.testing.assert_array_equal(X_filled_nb, X_filled)
+            np.testing.assert_array_equal(leading_missing_nb, leading_missing)
+
+        # torch.nanmedian() takes the lower one of the two middle values rather than their mean like np.nanmedian(),
+        # so the results of 'median' are not expected to be the same
+        for strategy in ["zero", "backward", "nan"]:
+            np.testing.assert_array_equal(
+                locf_torch(self._X_t, strategy).numpy(), locf_numpy(X, strategy)
+            )
+
     @pytest.mark.xdist_group(name="imputation-locf")
     def test_4_lazy_loading(self):
         self.locf_backward.fit(GENERAL_H5_TRAIN_SET_PATH, GENERAL_H5_VAL_SET_PATH)
@@ -11,6 +11,7 @@ import unittest
 
 import numpy as np
 import pytest
+import torch
 
 from pypots.imputation import SAITS
 from pypots.optim import Adam
@@ -132,6 +133,100 @@ class TestSAITS(unittest.TestCase):
         )
         logger.info(f"Lazy-loading SAITS test_MSE: {test_MSE}")
 
+    @pytest.mark.xdist_group(name="imputation-saits")
+    def test_5_loading_best_model(self):
+        saits = SAITS(
+            DATA["n_steps"],
+            DATA["n_features"],
+            n_layers=1,
+            d_model=16,
+            n_heads=2,
+            d_k=8,
+            d_v=8,
+            d_ffn=16,
+            epochs=4,
+            patience=2,
+            optimizer=Adam(lr=0.01),
+            device=DEVICE,
+        )
+
+        # make epoch 2 the best one, and take snapshots of the model weights at every epoch's validation
+        val_losses = iter([3.0, 1.0, 2.0, 2.5])
+        snapshots = []
+
+        def scripted_val_loss(model, inputs):
+            snapshots.append(
+                {k: v.clone() for k, v in saits.model.state_dict().items()}
+            )
+            return torch.tensor(next(val_losses))
+
+        saits._calc_val_loss = scripted_val_loss
+        # only one validating batch per epoch
+        val_set = {k: v[: saits.batch_size] for k, v in VAL_SET.items()}
+        saits.fit(TRAIN_SET, val_set)
+
+        assert saits.best_epoch == 2 and len(snapshots) == 4
+        # the model got updated after the best epoch, but the loaded weights should be the best epoch's
+        assert any(
+            not torch.equal(v, snapshots[1][k]) for k, v in snapshots[-1].items()
+        )
+        for k, v in saits.model.state_dict().items():
+            assert torch.equal(v, snapshots[1][k]), f"{k} is not from the best epoch"
+
+    @pytest.mark.xdist_group(name="imputation-saits")
+    def test_6_compiling_fallback(self):
+        # make the compiled model fail to run, the training should fall back to the eager mode
+        class FailingCompiledModule(torch.nn.Module):
+            def __init__(self, module):
+                super().__init__()
+                self._orig_mod = module
+
+            def forward(self, *args, **kwargs):
+                raise RuntimeError("failed to compile the model")
+
+        saits = SAITS(
+            DATA["n_steps"],
+            DATA["n_features"],
+            n_layers=1,
+            d_model=16,
+            n_heads=2,
+            d_k=8,
+            d_v=8,
+            d_ffn=16,
+            epochs=EPOCHS,
+            device=DEVICE,
+            compile_mode="default",
+        )
+        # keep the wrapper of the compiled model to check its state after training
+        compiled_models = []
+        compile_model_if_necessary = saits._compile_model_if_necessary
+
+        def recording_compile_model_if_necessary():
+            compiled_model = compile_model_if_necessary()
+            compiled_models.append(compiled_model)
+            return compiled_model
+
+        saits._compile_model_if_necessary = recording_compile_model_if_necessary
+        torch_compile = torch.compile
+        torch.compile = lambda model, **kwargs: FailingCompiledModule(model)
+        try:
+            with self.assertLogs(logger, "WARNING") as logs:
+                saits.fit(TRAIN_SET, VAL_SET)
+        finally:
+            torch.compile = torch_compile
+
+        assert len(compiled_models) == 1 and compiled_models[0].failed
+        assert any(
+            "Failed to run the model compiled by torch.compile" in log
+            for log in logs.output
+        )
+        assert saits.best_model_dict is not None
+
+        imputed_X = saits.impute(TEST_SET)
+        assert not np.isnan(
+            imputed_X
+        ).any(), "Output still has missing values after running impute()."
+
 
 if __name__ == "__main__":
     unittest.main()
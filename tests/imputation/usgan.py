@@ -11,6 +11,7 @@ import unittest
 
 import numpy as np
 import pytest
+import torch
 
 from pypots.imputation import USGAN
 from pypots.optim import Adam
@@ -116,6 +117,42 @@ class TestUSGAN(unittest.TestCase):
         )
         logger.info(f"Lazy-loading US-GAN test_MSE: {test_MSE}")
 
+    @pytest.mark.xdist_group(name="imputation-usgan")
+    def test_5_loading_best_model(self):
+        usgan = USGAN(
+            DATA["n_steps"],
+            DATA["n_features"],
+            16,
+            epochs=4,
+            patience=2,
+            G_optimizer=Adam(lr=0.01),
+            D_optimizer=Adam(lr=0.01),
+            device=DEVICE,
+        )
+
+        # make epoch 2 the best one, and take snapshots of the model weights at every epoch's validation
+        val_losses = iter([3.0, 1.0, 2.0, 2.5])
+        snapshots = []
+
+        def scripted_val_loss(model, inputs):
+            snapshots.append(
+                {k: v.clone() for k, v in usgan.model.state_dict().items()}
+            )
+            return torch.tensor(next(val_losses))
+
+        usgan._calc_val_loss = scripted_val_loss
+        # only one validating batch per epoch
+        val_set = {k: v[: usgan.batch_size] for k, v in VAL_SET.items()}
+        usgan.fit(TRAIN_SET, val_set)
+
+        assert usgan.best_epoch == 2 and len(snapshots) == 4
+        # the model got updated after the best epoch, but the loaded weights should be the best epoch's
+        assert any(
+            not torch.equal(v, snapshots[1][k]) for k, v in snapshots[-1].items()
+        )
+        for k, v in usgan.model.state_dict().items():
+            assert torch.equal(v, snapshots[1][k]), f"{k} is not from the best epoch"
+
 
 if __name__ == "__main__":
     unittest.main()